@@ -1,7 +1,34 @@
 # Dependências
 import glm
 import numpy as np
-from math import cos, sin
+from math import cos, sin, pi
+
+# Fator de conversão de graus para radianos
+_DEG2RAD = pi / 180.0
+
+
+def compute_front_batch(yaws, pitches):
+    '''
+    Calcula, em lote, os vetores de fronte correspondentes a 
+    pares de ângulos (yaw, pitch), seguindo a mesma convenção 
+    de Camera.move_front. Retorna um array (N, 3) de float32.
+
+    Parâmetros:
+    ----------
+    yaws: Sequence
+        Ângulos de yaw em graus.
+    pitches: Sequence
+        Ângulos de pitch em graus.
+    '''
+    yaws = np.radians(np.asarray(yaws, dtype=np.float32))
+    pitches = np.radians(np.asarray(pitches, dtype=np.float32))
+    cos_pitches = np.cos(pitches)
+    fronts = np.empty((len(yaws), 3), dtype=np.float32)
+    np.multiply(np.cos(yaws), cos_pitches, out=fronts[:, 0])
+    np.sin(pitches, out=fronts[:, 1])
+    np.multiply(np.sin(yaws), cos_pitches, out=fronts[:, 2])
+    return fronts
+
 
 class Camera:
     ''' Câmera de visualização 3D para ser utilizada com o OpenGL '''
@@ -17,10 +44,16 @@ class Camera:
     yaw = 0.0
     pitch = 0.0
 
-    # Atributos posicionais
-    position = None
-    front = None
-    up = None
+    # Atributos posicionais (expostos como propriedades)
+    _position = None
+    _front = None
+    _up = None
+
+    # Valores em cache; atualizados quando position, front ou up mudam
+    _right = None
+    _target = None
+    _view_buffer = None
+    _view_outdated = True
 
     def __init__(
         self, 
@@ -48,29 +81,96 @@ class Camera:
         # Atributos posicionais
         if position is None:
             position = (0.0,  0.0,  1.0)
-        self.position = glm.vec3(*position)
-        self.front = glm.vec3(0.0,  0.0, -1.0);
-        self.up = glm.vec3(0.0,  1.0,  0.0)
+        self._position = glm.vec3(*position)
+        self._front = glm.vec3(0.0,  0.0, -1.0);
+        self._up = glm.vec3(0.0,  1.0,  0.0)
+        self._right = None
+        self._target = glm.vec3()
+        self._view_buffer = np.empty((4, 4), dtype=np.float32)
+        self._update_target()
+
+    @property
+    def position(self):
+        ''' 
+        Posição da câmera. Atribuições atualizam a visão; alterações 
+        diretas nos componentes do vetor retornado não são detectadas.
+        '''
+        return self._position
+
+    @position.setter
+    def position(self, value):
+        self._position = glm.vec3(value)
+        self._update_target()
+
+    @property
+    def front(self):
+        ''' 
+        Direção de visão da câmera. Atribuições atualizam a visão; alterações 
+        diretas nos componentes do vetor retornado não são detectadas.
+        '''
+        return self._front
+
+    @front.setter
+    def front(self, value):
+        self._front = glm.vec3(value)
+        self._right = None
+        self._update_target()
+
+    @property
+    def up(self):
+        ''' 
+        Vetor vertical da câmera. Atribuições atualizam a visão; alterações 
+        diretas nos componentes do vetor retornado não são detectadas.
+        '''
+        return self._up
+
+    @up.setter
+    def up(self, value):
+        self._up = glm.vec3(value)
+        self._right = None
+        self._view_outdated = True
+
+    def _get_right(self):
+        ''' Vetor lateral normalizado, recalculado apenas após mudanças de fronte '''
+        if self._right is None:
+            self._right = glm.normalize(glm.cross(self._front, self._up))
+        return self._right
+
+    def _update_target(self):
+        ''' Atualiza, no próprio vetor, o ponto observado e invalida a visão '''
+        t = self._target
+        t.x = self._position.x + self._front.x
+        t.y = self._position.y + self._front.y
+        t.z = self._position.z + self._front.z
+        self._view_outdated = True
+
+    def _displace(self, direction, amount):
+        ''' Desloca a posição, no próprio vetor, ao longo de uma direção '''
+        p = self._position
+        p.x += amount * direction.x
+        p.y += amount * direction.y
+        p.z += amount * direction.z
+        self._update_target()
     
     def move_forward(self, *_):
         ''' Mover para frente caso ativa '''
-        if self.active == True:
-            self.position += self.speed * self.front
+        if self.active:
+            self._displace(self._front, self.speed)
     
     def move_right(self, *_):
         ''' Mover para a direita caso ativa '''
-        if self.active == True:
-            self.position += self.speed * glm.normalize(glm.cross(self.front, self.up))
+        if self.active:
+            self._displace(self._get_right(), self.speed)
     
     def move_backward(self, *_):
         ''' Mover para trás caso ativa '''
-        if self.active == True:
-            self.position -= self.speed * self.front
+        if self.active:
+            self._displace(self._front, -self.speed)
 
     def move_left(self, *_):
         ''' Mover para a esquerda caso ativa '''
-        if self.active == True:
-            self.position -= self.speed * glm.normalize(glm.cross(self.front, self.up))
+        if self.active:
+            self._displace(self._get_right(), -self.speed)
     
     def move_front(self, xpos, ypos):
         ''' Movimentação do fronte de visão via cursor do mouse '''
@@ -91,22 +191,33 @@ class Camera:
         elif self.pitch <= -90.0: 
             self.pitch = -90.0
 
-        # Atualização da visão
-        front = glm.vec3()
-        front.x = cos(glm.radians(self.yaw)) * cos(glm.radians(self.pitch))
-        front.y = sin(glm.radians(self.pitch))
-        front.z = sin(glm.radians(self.yaw)) * cos(glm.radians(self.pitch))
-        self.front = glm.normalize(front)
+        # Atualização da visão; o vetor resultante já é unitário
+        yaw = self.yaw * _DEG2RAD
+        pitch = self.pitch * _DEG2RAD
+        cos_pitch = cos(pitch)
+        self._front = glm.vec3(
+            cos(yaw) * cos_pitch, 
+            sin(pitch), 
+            sin(yaw) * cos_pitch
+        )
+        self._right = None
+        self._update_target()
     
     @property
     def view(self):
-        return np.array (
-            glm.lookAt (
-                self.position, 
-                self.position + self.front, 
-                self.up
+        ''' 
+        Matriz de visão, recalculada apenas após movimentações. 
+        O mesmo buffer é reutilizado a cada recálculo; copie-o 
+        caso precise preservar um valor anterior.
+        '''
+        if self._view_outdated:
+            self._view_buffer[...] = glm.lookAt (
+                self._position, 
+                self._target, 
+                self._up
             )
-        )
+            self._view_outdated = False
+        return self._view_buffer
 
 
 class RestrictedCamera(Camera):
@@ -139,39 +250,39 @@ class RestrictedCamera(Camera):
         self.max_zpos = max_zpos
     
     def check_position(self):
-        x, y, z = self.position
-        if x < self.min_xpos or x > self.max_xpos:
-            return False
-        if y < self.min_ypos or y > self.max_ypos:
-            return False
-        if z < self.min_zpos or z > self.max_zpos:
-            return False
-        return True
+        ''' Verifica se a posição atual respeita os limites da câmera '''
+        # Limites arredondados à mesma precisão da posição (float32)
+        p = self._position
+        lower = glm.vec3(self.min_xpos, self.min_ypos, self.min_zpos)
+        upper = glm.vec3(self.max_xpos, self.max_ypos, self.max_zpos)
+        return glm.clamp(p, lower, upper) == p
+    
+    def _clamp(self):
+        ''' Restringe a posição atual aos limites da câmera, caso ativa '''
+        if not self.active:
+            return
+        p = self._position
+        p.x = min(max(p.x, self.min_xpos), self.max_xpos)
+        p.y = min(max(p.y, self.min_ypos), self.max_ypos)
+        p.z = min(max(p.z, self.min_zpos), self.max_zpos)
+        self._update_target()
     
     def move_forward(self, *_):
         ''' Mover para frente caso ativa '''
-        x, y, z = self.position
         super().move_forward()
-        if self.check_position() == False:
-            self.position = glm.vec3(x,y,z)
+        self._clamp()
     
     def move_right(self, *_):
         ''' Mover para a direita caso ativa '''
-        x, y, z = self.position
         super().move_right()
-        if self.check_position() == False:
-            self.position = glm.vec3(x,y,z)
+        self._clamp()
     
     def move_backward(self, *_):
         ''' Mover para trás caso ativa '''
-        x, y, z = self.position
         super().move_backward()
-        if self.check_position() == False:
-            self.position = glm.vec3(x,y,z)
+        self._clamp()
 
     def move_left(self, *_):
         ''' Mover para a esquerda caso ativa '''
-        x, y, z = self.position
         super().move_left()
-        if self.check_position() == False:
-            self.position = glm.vec3(x,y,z)
\ No newline at end of file
+        self._clamp()
\ No newline at end of file
@@ -1,17 +1,33 @@
 # Dependências
-from numpy import hstack
-from numpy.random import normal
+from functools import lru_cache
+from numpy import array, empty, float32
+from numpy.random import default_rng
+
+# Gerador de números aleatórios do módulo
+_RNG = default_rng()
 
 def rgb_random_color(opacity=1.0):
     ''' Gera uma cor RGB aleatória com opacidade opcional '''
-    return hstack([normal(0.0, 1.0, size=3), (opacity)])
+    color = empty(4, dtype=float32)
+    _RNG.standard_normal(dtype=float32, out=color[:3])
+    color[3] = opacity
+    return color
+
+
+def _shared_color(red, green, blue, opacity):
+    ''' Constrói uma cor RGB, com opacidade, imutável '''
+    color = array((red, green, blue, opacity), dtype=float32)
+    color.flags.writeable = False
+    return color
 
 
+@lru_cache(maxsize=32)
 def rgb_black_color(opacity=1.0):
-    ''' Retorna uma tupla RGB, com opacidade, para a coloração preta '''
-    return (0.0, 0.0, 0.0, opacity)
+    ''' Retorna uma cor RGB compartilhada, com opacidade, para a coloração preta '''
+    return _shared_color(0.0, 0.0, 0.0, opacity)
 
 
+@lru_cache(maxsize=32)
 def rgb_white_color(opacity=1.0):
-    ''' Retorna uma tupla RGB, com opacidade, para a coloração branca '''
-    return (1.0, 1.0, 1.0, opacity)
\ No newline at end of file
+    ''' Retorna uma cor RGB compartilhada, com opacidade, para a coloração branca '''
+    return _shared_color(1.0, 1.0, 1.0, opacity)
\ No newline at end of file
@@ -1,67 +1,159 @@
 # Dependências
 from collections.abc import Sequence
-from numpy import identity, array
+from os.path import abspath, getmtime
+from ctypes import POINTER, c_float
+from numpy import array, empty, fromiter, ascontiguousarray, float32
 from pywavefront import Wavefront
+from utils.transformations import _IDENTITY4
+
+
+# Materiais já carregados de cada arquivo, dispensando uma nova leitura: 
+# caminho -> (mtime, ((nome, iluminação, textura, buffers), ...))
+_MATERIALS = dict()
+
+
+def _split_vertices(material):
+    ''' 
+    Separa os vértices intercalados de um material no formato 
+    "T2F_N3F_V3F", retornando (texturas, normais, vértices). 
+    O resultado é compartilhado entre todos os controladores 
+    do mesmo material e, portanto, somente leitura.
+    '''
+    FACE_SIZE = 8
+    mv = material.vertices
+    faces = fromiter(mv, dtype=float32, count=len(mv)).reshape(-1, FACE_SIZE)
+    buffers = (
+        ascontiguousarray(faces[:, 0:2]),
+        ascontiguousarray(faces[:, 2:5]),
+        ascontiguousarray(faces[:, 5:8]),
+    )
+    for buffer in buffers:
+        buffer.setflags(write=False)
+    return buffers
+
+
+def _load_materials(path):
+    ''' 
+    Retorna os materiais de um arquivo .obj como registros 
+    (nome, iluminação, caminho da textura, buffers). O arquivo 
+    é lido pelo pywavefront apenas na primeira carga ou após 
+    ser modificado; a cena é descartada, restando apenas os 
+    registros, cujos vetores em float32 são compartilhados.
+    '''
+    mtime = getmtime(path)
+    cached = _MATERIALS.get(path)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+    scene = Wavefront(path, collect_faces=True)
+    records = []
+    for name, material in scene.materials.items():
+        lighting = (
+            material.ambient[0], 
+            material.diffuse[0], 
+            material.specular[0], 
+            material.shininess
+        )
+        try:
+            texture_filepath = material.texture._path
+        except AttributeError:
+            texture_filepath = "obj/blank.png"
+        records.append((name, lighting, texture_filepath, _split_vertices(material)))
+    records = tuple(records)
+    _MATERIALS[path] = (mtime, records)
+    return records
+
+
+class _ModelRef:
+    ''' Referência à matriz model compartilhada pelos materiais de um objeto '''
+    __slots__ = ('gl', 'gl_pointer')
+
+    def __init__(self, m):
+        # Cópia alocada uma única vez, com ponteiro C pronto para o OpenGL
+        self.gl = empty((4, 4), dtype=float32)
+        self.gl_pointer = self.gl.ctypes.data_as(POINTER(c_float))
+        self.set(m)
+
+    def set(self, m):
+        ''' Atualiza a matriz, armazenada em float32 na ordem de colunas do OpenGL '''
+        self.gl.T[...] = m
+
+    @property
+    def m(self):
+        ''' 
+        Matriz model, como visão da matriz enviada à GPU: alterações 
+        diretas em seus elementos valem a partir do próximo quadro.
+        '''
+        return self.gl.T
+
 
 class WaveFrontMaterialController:
     ''' Classe de controle de acesso às características de um material WaveFront '''
 
-    def __init__(self, name, material, model):
-        ''' Inicialização a partir de um material '''
+    __slots__ = (
+        'name', '_model_ref', 
+        'lighting',
+        'textures', 'normals', 'vertices', 
+        'texture_filepath'
+    )
+
+    def __init__(self, name, lighting, texture_filepath, model_ref, buffers):
+        ''' Inicialização a partir de um material já carregado '''
 
         # Nome da componente
         self.name = name
 
-        # Matriz model (guarda a referência)
-        self.model = model
+        # Matriz model (referência compartilhada com o objeto)
+        self._model_ref = model_ref
 
-        # Controle de iluminação
-        self.ka = material.ambient[0]
-        self.kd = material.diffuse[0]
-        self.ks = material.specular[0]
-        self.ns = material.shininess
+        # Controle de iluminação (somente leitura)
+        self.lighting = array(lighting, dtype=float32)
+        self.lighting.setflags(write=False)
 
-        # Listas de vértices
-        textures = []
-        normals = []
-        vertices = []
+        # Vértices de textura, normais e posições (compartilhados)
+        self.textures, self.normals, self.vertices = buffers
 
-        # Dados
-        FACE_SIZE = 8
-        mv = material.vertices
+        # Armazenamento do caminho da textura
+        self.texture_filepath = texture_filepath
 
-        # Aquisição e separação dos vértices; formato "T2F_N3F_V3F"
-        for idx in range(0, len(mv), FACE_SIZE):
+    @property
+    def ka(self):
+        ''' Coeficiente de reflexão ambiente '''
+        return float(self.lighting[0])
 
-            # T2F
-            textures.append(mv[idx])
-            textures.append(mv[idx+1])
+    @property
+    def kd(self):
+        ''' Coeficiente de reflexão difusa '''
+        return float(self.lighting[1])
 
-            # N3F
-            normals.append(mv[idx+2])
-            normals.append(mv[idx+3])
-            normals.append(mv[idx+4])
+    @property
+    def ks(self):
+        ''' Coeficiente de reflexão especular '''
+        return float(self.lighting[2])
 
-            # V3F
-            vertices.append(mv[idx+5])
-            vertices.append(mv[idx+6])
-            vertices.append(mv[idx+7])
+    @property
+    def ns(self):
+        ''' Expoente de brilho especular '''
+        return float(self.lighting[3])
 
-        # Armazenamento dos vértices
-        self.textures = array(textures).reshape(-1,2)
-        self.normals = array(normals).reshape(-1,3)
-        self.vertices = array(vertices).reshape(-1,3)
+    @property
+    def model(self):
+        ''' Matriz model atual do objeto ao qual o material pertence '''
+        return self._model_ref.m
 
-        # Armazenamento do caminho da textura
-        try:
-            self.texture_filepath = material.texture._path
-        except AttributeError:
-            self.texture_filepath = "obj/blank.png"
+    @property
+    def model_ref(self):
+        ''' Referência da matriz model, compartilhada pelos materiais de um mesmo objeto '''
+        return self._model_ref
 
 
 
 class WaveFrontObject:
-    ''' Componente OpenGL para representação de objetos WaveFront '''
+    ''' 
+    Componente OpenGL para representação de objetos WaveFront. 
+    A matriz model é uma visão, em float32, da matriz enviada à GPU: 
+    pode ser substituída por meio de set_model ou alterada diretamente 
+    (e.g. obj.model[0, 3] += 1), valendo a partir do próximo quadro.
+    '''
 
     def __init__(self, obj_filename:str, model:Sequence = None):
         '''
@@ -72,27 +164,37 @@ class WaveFrontObject:
         obj_filename: str
             Caminho para o arquivo .obj.
         model: Sequence, default = None
-            Matriz de modelo da componente. Caso nenhuma seja fornecida, 
-            utilizará a matriz identidade.
+            Matriz de modelo da componente, copiada para o buffer 
+            enviado à GPU. Caso nenhuma seja fornecida, utilizará 
+            a matriz identidade.
         '''
-        # Carregamento do modelo do objeto
-        scene = Wavefront(obj_filename, collect_faces=True)
+        # Carregamento dos materiais do objeto, lidos uma única 
+        # vez por arquivo enquanto este não for modificado
+        records = _load_materials(abspath(obj_filename))
         
         # Matriz Model
         if model is None:
-            model = identity(4)
-        self.model = model
+            model = _IDENTITY4
+        self._model_ref = _ModelRef(model)
 
         # Extração dos materiais
         self.materials = [
-            WaveFrontMaterialController(name, material, self.model) 
-            for name, material in scene.materials.items()
+            WaveFrontMaterialController(
+                name, lighting, texture_filepath, self._model_ref, buffers
+            ) 
+            for name, lighting, texture_filepath, buffers in records
         ]
 
+    @property
+    def model(self):
+        ''' Matriz model atual, idêntica à enviada à GPU '''
+        return self._model_ref.m
+
     def set_model(self, value):
-        ''' Atualização da matriz Model '''
-        self.model = value
-        for mt in self.materials:
-            mt.model = value
+        ''' 
+        Atualização da matriz Model, copiada e enviada à GPU 
+        no próximo quadro.
+        '''
+        self._model_ref.set(value)
         
             
\ No newline at end of file
@@ -1,8 +1,20 @@
 # Dependências
 import glfw
-from collections import defaultdict
 import numpy as np
-import glm
+from math import tan, radians, inf
+
+
+# Códigos GLFW de teclas e botões do mouse, indexados pelo nome
+_KEY_CODES = {
+    name[len("KEY_"):]: code 
+    for name, code in vars(glfw).items() 
+    if name.startswith("KEY_")
+}
+_MOUSE_BUTTON_CODES = {
+    name[len("MOUSE_BUTTON_"):]: code 
+    for name, code in vars(glfw).items() 
+    if name.startswith("MOUSE_BUTTON_")
+}
 
 
 # Exceções
@@ -25,6 +37,7 @@ class GLFWWindow:
     initial_cursor_pos = None
     projection = None
     aspect = None
+    _projection_params = None
 
     def __init__(self, width:int, height:int, title:str = "", *, monitor:int = None, share:int = None):
         ''' 
@@ -48,31 +61,44 @@ class GLFWWindow:
         if not glfw.init():
             raise GLFWInitializationError()
         
-        # Criação da janela
+        # Criação da janela; contexto OpenGL 3.3 core, exigido pelos 
+        # shaders (GLSL 330 core), inclusive no macOS
         glfw.window_hint(glfw.VISIBLE, glfw.FALSE);
+        glfw.window_hint(glfw.CONTEXT_VERSION_MAJOR, 3)
+        glfw.window_hint(glfw.CONTEXT_VERSION_MINOR, 3)
+        glfw.window_hint(glfw.OPENGL_PROFILE, glfw.OPENGL_CORE_PROFILE)
+        glfw.window_hint(glfw.OPENGL_FORWARD_COMPAT, glfw.TRUE)
         window = glfw.create_window(width, height, title, monitor, share)
         if not window:
             glfw.terminate()
             raise WindowCreationError()
         glfw.make_context_current(window)
 
+        # Sincronização vertical; a troca de buffers aguarda o monitor
+        glfw.swap_interval(1)
+
         # Registro dos atributos
         self.window = window
-        self.key_callbacks = defaultdict(list)
-        self.mouse_callbacks = defaultdict(list)
+        self.key_callbacks = dict()
+        self.mouse_callbacks = dict()
         self.cursor_callbacks = []
         self.initial_cursor_pos = (width/2, height/2)
         self.aspect = width/height
 
+        # Buffer da matriz de projeção; preenchido por get_projection
+        self.projection = np.zeros((4, 4), dtype=np.float32)
+        self.projection[3, 2] = -1.0
+        self._projection_params = None
+
         # Eventos de tecla
         def key_event(window, key, scancode, action, mods):
-            for callback in self.key_callbacks[key]:
+            for callback in self.key_callbacks.get(key, ()):
                 callback(key, action)
         glfw.set_key_callback(window, key_event)
 
         # Eventos de clique
         def mouse_event(window,button,action,mods):
-            for callback in self.mouse_callbacks[button]:
+            for callback in self.mouse_callbacks.get(button, ()):
                 callback(button, action)
         glfw.set_mouse_button_callback(window,mouse_event)
 
@@ -84,12 +110,23 @@ class GLFWWindow:
     
 
     def get_projection(self, fovy=45.0, near=0.1, far=1000.0):
-        ''' Projeção de tela '''
-        return np.array (
-            glm.perspective (
-                glm.radians(fovy), self.aspect, near, far
-            )
-        )
+        ''' 
+        Projeção perspectiva de tela, equivalente a glm.perspective. 
+        A matriz é recalculada apenas quando os parâmetros mudam, 
+        reutilizando sempre o mesmo buffer.
+        '''
+        params = (fovy, near, far, self.aspect)
+        if params != self._projection_params:
+            tan_half_fovy = tan(radians(fovy) / 2.0)
+            f = 1.0 / tan_half_fovy if tan_half_fovy != 0.0 else inf
+            depth = near - far
+            projection = self.projection
+            projection[0, 0] = f / self.aspect
+            projection[1, 1] = f
+            projection[2, 2] = (far + near) / depth
+            projection[2, 3] = (2.0 * far * near) / depth
+            self._projection_params = params
+        return self.projection
     
 
     def add_key_callback(self, key:str, callback):
@@ -109,10 +146,10 @@ class GLFWWindow:
             ação realizada nessa tecla.
         '''
         try:
-            key = getattr(glfw, "KEY_{}".format(key.upper()))
-            self.key_callbacks[key].append(callback)
-        except:
-            raise UnknownKeyError()
+            key = _KEY_CODES[key.upper()]
+        except (KeyError, AttributeError):
+            raise UnknownKeyError(key) from None
+        self.key_callbacks.setdefault(key, []).append(callback)
     
 
     def add_mouse_callback(self, button:str, callback):
@@ -132,10 +169,10 @@ class GLFWWindow:
             ação realizada nessa tecla.
         '''
         try:
-            button = getattr(glfw, "MOUSE_BUTTON_{}".format(button.upper()))
-            self.mouse_callbacks[button].append(callback)
-        except:
-            raise UnknownKeyError()
+            button = _MOUSE_BUTTON_CODES[button.upper()]
+        except (KeyError, AttributeError):
+            raise UnknownKeyError(button) from None
+        self.mouse_callbacks.setdefault(button, []).append(callback)
     
 
     def add_cursor_callback(self, callback):
@@ -160,21 +197,26 @@ class GLFWWindow:
         '''
         # Habilitação da janela
         window = self.window
-        glfw.show_window(self.window)
+        glfw.show_window(window)
         glfw.set_cursor_pos(window, *self.initial_cursor_pos)
+
+        # Referências locais das funções usadas a cada quadro
+        window_should_close = glfw.window_should_close
+        poll_events = glfw.poll_events
+        swap_buffers = glfw.swap_buffers
         try:
 
             # Enquanto não encerrá-la, itera
-            while not glfw.window_should_close(self.window):
+            while not window_should_close(window):
 
                 # Processa os eventos da biblioteca
-                glfw.poll_events()
+                poll_events()
 
                 # Entrega o fluxo de controle
                 yield
 
                 # Realiza a troca de buffers CPU-GPU
-                glfw.swap_buffers(window)
+                swap_buffers(window)
 
         # Encerra a biblioteca
         finally:
@@ -12,8 +12,13 @@ def flatten(items:Iterable):
     items: Iterable
         Coleção iterável de elementos.
     '''
-    for item in items:
-        if isinstance(item, Iterable):
-            yield from flatten(item)
+    # Pilha de iteradores, evitando um gerador por nível de aninhamento
+    stack = [iter(items)]
+    while stack:
+        for item in stack[-1]:
+            if isinstance(item, Iterable) and not isinstance(item, (str, bytes)):
+                stack.append(iter(item))
+                break
+            yield item
         else:
-            yield item
\ No newline at end of file
+            stack.pop()
\ No newline at end of file
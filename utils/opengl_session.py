@@ -1,13 +1,178 @@
 # Dependências
+import os
+import hashlib
+import tempfile
 import numpy as np
 from PIL import Image
 import ctypes
+from concurrent.futures import ThreadPoolExecutor
+import OpenGL
+if not __debug__:
+    # Sem verificação de erros e de tamanhos a cada chamada (python -O); 
+    # precisa anteceder a primeira importação de OpenGL.GL
+    OpenGL.ERROR_CHECKING = False
+    OpenGL.ERROR_LOGGING = False
+    OpenGL.ARRAY_SIZE_CHECKING = False
 from OpenGL.GL import *
+from OpenGL.error import GLError
 from collections.abc import Sequence
 from utils.glfw_window import GLFWWindow
 from utils.components import WaveFrontObject
 from utils.typeutils import check_type
 from utils.iterutils import flatten
+from utils.transformations import _IDENTITY4
+
+
+# Programas já construídos, por contexto (janela) e código dos shaders
+_PROGRAM_CACHE = dict()
+
+# Última cor de limpeza enviada à GPU, por contexto (janela); sessões 
+# no mesmo contexto compartilham esse estado
+_CLEAR_COLORS = dict()
+
+# Diretório de cache dos binários de programas já construídos
+_PROGRAM_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "opengl_session")
+
+# Versão do GLSL dos shaders, antecedendo qualquer outra diretiva
+_GLSL_VERSION = "#version 330 core\n"
+
+# Coloração da luz, incorporada ao shader de fragmentos como constante
+_LIGHT_COLOR = (0.32, 0.32, 0.32)
+
+# Código C para manipulação e transformação dos vértices
+_VERTEX_CODE = _GLSL_VERSION + """
+    // Vetor de posições
+    layout(location = 0) in vec3 position;
+
+    // Para manipulação de texturas
+    layout(location = 1) in vec2 texture_coord;
+    out vec2 out_texture;
+
+    // Para manipulação de normais
+    layout(location = 2) in vec3 normals;
+    out vec3 out_normal;
+
+    // Para manipulação de fragmentos
+    out vec3 out_fragPos;
+    
+    // Matrizes de modelo, visão e projeção
+    uniform mat4 model;
+    uniform mat4 view;
+    uniform mat4 projection;        
+    
+    // Programa principal
+    void main(){
+        gl_Position = projection * view * model * vec4(position,1.0);
+        out_texture = vec2(texture_coord);
+        out_fragPos = vec3(model * vec4(position, 1.0));
+        out_normal = vec3(model * vec4(normals, 1.0));            
+    }
+"""
+
+# Código C para manipulação e transformação dos fragmentos, 
+# com as constantes injetadas antes da compilação
+_FRAGMENT_CODE = _GLSL_VERSION + "#define LIGHT_COLOR vec3(%r, %r, %r)\n" % _LIGHT_COLOR + """
+    // Posição e coloração da luz (constante, definida antes da compilação)
+    uniform vec3 lightPos;
+    const vec3 lightColor = LIGHT_COLOR;
+    
+    // Parâmetros de iluminação do material: coeficientes de reflexão 
+    // ambiente (x), difusa (y) e especular (z), e expoente especular (w)
+    uniform vec4 lighting;
+
+    // Parâmetros da iluminação especular
+    uniform vec3 viewPos;   // Define coordenadas com a posição da câmera/observador
+    
+    // Parâmetros recebidos do vertex shader
+    in vec2 out_texture;
+    in vec3 out_normal;
+    in vec3 out_fragPos;
+    uniform sampler2D samplerTexture;
+
+    // Cor resultante do fragmento
+    out vec4 fragColor;
+    
+    // Programa principal
+    void main(){
+
+        // Parâmetros de iluminação do material
+        float ka = lighting.x;
+        float kd = lighting.y;
+        float ks = lighting.z;
+        float ns = lighting.w;
+    
+        // Cálculo de reflexão ambiente
+        vec3 ambient = ka * lightColor;             
+    
+        // Cálculo de reflexão difusa
+        vec3 norm = normalize(out_normal); // normaliza vetores perpendiculares
+        vec3 lightDir = normalize(lightPos - out_fragPos); // direcao da luz
+        float diff = max(dot(norm, lightDir), 0.0); // verifica limite angular (entre 0 e 90)
+        vec3 diffuse = kd * diff * lightColor; // iluminacao difusa
+        
+        // Cálculo de reflexão especular
+        vec3 viewDir = normalize(viewPos - out_fragPos); // direcao do observador/camera
+        vec3 reflectDir = normalize(reflect(-lightDir, norm)); // direcao da reflexao
+        float spec = pow(max(dot(viewDir, reflectDir), 0.0), ns);
+        vec3 specular = ks * spec * lightColor;             
+        
+        // Aplicação do modelo de iluminação
+        vec4 color = texture(samplerTexture, out_texture);
+        vec4 result = vec4((ambient + diffuse + specular),1.0) * color; // aplica iluminacao
+        fragColor = result;
+    }
+"""
+
+# Identificação do par de shaders, usada como chave dos caches de programas
+_PROGRAM_DIGEST = hashlib.sha1((_VERTEX_CODE + _FRAGMENT_CODE).encode()).hexdigest()
+
+
+# Atributos do GLSL intercalados em cada vértice do buffer da GPU: (localização 
+# no shader, quantia de componentes, tipo, normalização, deslocamento em bytes);
+# as normais ocupam uma única palavra de 32 bits (10 bits por eixo)
+_VERTEX_ATTRIBUTES = {
+    "position": (0, 3, GL_FLOAT, GL_FALSE, 0), 
+    "texture_coord": (1, 2, GL_FLOAT, GL_FALSE, 12), 
+    "normals": (2, 4, GL_INT_2_10_10_10_REV, GL_TRUE, 20),
+}
+
+# Quantia de palavras de 32 bits de um vértice completo
+_VERTEX_SIZE = 6
+
+
+def _pack_normals(normals, out):
+    '''
+    Empacota normais unitárias no formato GL_INT_2_10_10_10_REV, 
+    com cada eixo como inteiro de 10 bits com sinal.
+
+    Parâmetros:
+    ----------
+    normals: ndarray
+        Normais em float32, com formato (N, 3).
+    out: ndarray
+        Vetor uint32 de tamanho N que receberá as normais empacotadas.
+    '''
+    axes = np.rint(np.clip(normals, -1.0, 1.0) * 511.0).astype(np.int32) & 0x3FF
+    out[...] = axes[:, 0] | (axes[:, 1] << 10) | (axes[:, 2] << 20)
+
+
+def _decode_texture(filename):
+    '''
+    Decodifica uma imagem de textura, retornando sua largura, 
+    sua altura e seus bytes. Não faz chamadas ao OpenGL, podendo 
+    ser executada fora da thread do contexto.
+
+    Parâmetros:
+    ----------
+    filename: str
+        Caminho do arquivo de imagem.
+    '''
+    # O arquivo é fechado após a leitura; BGRA é o formato nativo da 
+    # maioria das GPUs, sem conversão no driver. As linhas seguem a 
+    # ordem do arquivo: o eixo V é invertido nos vértices
+    with Image.open(filename) as img:
+        img = img.convert("RGBA")
+        return img.size[0], img.size[1], img.tobytes("raw", "BGRA")
 
 
 # Exceções
@@ -38,20 +203,31 @@ class OpenGLSession:
     ''' Atributos de controle '''
     components = None
     program = None
-    clear_color = None
+    _context = None
+    _clear_color = None
     buffered = False
+    _version = 0
+    _buffered_version = None
+    draw_ranges = None
+    draw_batches = None
+    texture_ids = None
+    vertex_array = None
+    vertex_buffer = None
+    _vertex_buffer_capacity = 0
 
     ''' Buffers de matriz '''
     model_buffer = None
     view_buffer = None
     projection_buffer = None
     
+    ''' Último estado enviado à GPU durante a renderização '''
+    _bound_lighting = None
+    _bound_texture = None
+    _bound_model = None
+
     ''' Buffers de iluminação '''
     light_buffer = None
-    ka_buffer = None
-    kd_buffer = None
-    ks_buffer = None
-    ns_buffer = None
+    lighting_buffer = None
 
     def __init__(self, window:GLFWWindow) -> None:
         '''
@@ -64,84 +240,54 @@ class OpenGLSession:
         # Verifica os argumentos fornecidos
         check_type(window, "window", GLFWWindow)
 
-        # Código C para manipulação e transformação dos vértices
-        vertex_code = """
-            // Vetor de posições
-            attribute vec3 position;
+        # Reaproveita o programa já construído neste contexto, caso exista
+        context = ctypes.cast(window.window, ctypes.c_void_p).value
+        key = (context, _PROGRAM_DIGEST)
+        program = _PROGRAM_CACHE.get(key)
+        if program is None or not glIsProgram(program):
+            program = self._build_program(_VERTEX_CODE, _FRAGMENT_CODE, _PROGRAM_DIGEST)
+            _PROGRAM_CACHE[key] = program
+            # Contexto novo: a cor de limpeza registrada não é mais válida
+            _CLEAR_COLORS.pop(context, None)
+        self._context = context
+
+        # Faz do programa atual o inicializado anteriormente
+        glUseProgram(program)
+        self.program = program
+
+        # Aquisição dos buffers de controle das matrizes
+        self.model_buffer = glGetUniformLocation(program, "model")
+        self.view_buffer = glGetUniformLocation(program, "view")
+        self.projection_buffer = glGetUniformLocation(program, "projection")
 
-            // Para manipulação de texturas
-            attribute vec2 texture_coord;
-            varying vec2 out_texture;
+        # Aquisição dos buffers de controle de iluminação
+        self.lighting_buffer = glGetUniformLocation(program, "lighting")
+        self.light_buffer = glGetUniformLocation(program, "lightPos")
 
-            // Para manipulação de normais
-            attribute vec3 normals;
-            varying vec3 out_normal;
-        
-            // Para manipulação de fragmentos
-            varying vec3 out_fragPos;
-            
-            // Matrizes de modelo, visão e projeção
-            uniform mat4 model;
-            uniform mat4 view;
-            uniform mat4 projection;        
-            
-            // Programa principal
-            void main(){
-                gl_Position = projection * view * model * vec4(position,1.0);
-                out_texture = vec2(texture_coord);
-                out_fragPos = vec3(model * vec4(position, 1.0));
-                out_normal = vec3(model * vec4(normals, 1.0));            
-            }
-        """
-
-        # Código C para manipulação e transformação dos fragmentos
-        fragment_code = """
-            // Posição e coloração da luz
-            uniform vec3 lightPos;
-            vec3 lightColor = vec3(0.32, 0.32, 0.32);
-            
-            // Parâmetros da iluminação ambiente e difusa
-            uniform float ka;   // Coeficiente de reflexão ambiente
-            uniform float kd;   // Coeficiente de reflexão difusa
-            
-            // Parâmetros da iluminação especular
-            uniform vec3 viewPos;   // Define coordenadas com a posição da câmera/observador
-            uniform float ks;       // Coeficiente de reflexão especular
-            uniform float ns;       // Expoente de reflexão especular
-            
-            // Parâmetros recebidos do vertex shader
-            varying vec2 out_texture;
-            varying vec3 out_normal;
-            varying vec3 out_fragPos;
-            uniform sampler2D samplerTexture;
-            
-            // Programa principal
-            void main(){
-            
-                // Cálculo de reflexão ambiente
-                vec3 ambient = ka * lightColor;             
-            
-                // Cálculo de reflexão difusa
-                vec3 norm = normalize(out_normal); // normaliza vetores perpendiculares
-                vec3 lightDir = normalize(lightPos - out_fragPos); // direcao da luz
-                float diff = max(dot(norm, lightDir), 0.0); // verifica limite angular (entre 0 e 90)
-                vec3 diffuse = kd * diff * lightColor; // iluminacao difusa
-                
-                // Cálculo de reflexão especular
-                vec3 viewDir = normalize(viewPos - out_fragPos); // direcao do observador/camera
-                vec3 reflectDir = normalize(reflect(-lightDir, norm)); // direcao da reflexao
-                float spec = pow(max(dot(viewDir, reflectDir), 0.0), ns);
-                vec3 specular = ks * spec * lightColor;             
-                
-                // Aplicação do modelo de iluminação
-                vec4 texture = texture2D(samplerTexture, out_texture);
-                vec4 result = vec4((ambient + diffuse + specular),1.0) * texture; // aplica iluminacao
-                gl_FragColor = result;
-            }
-        """
-
-        # Requisição de programa e de slots da GPU
-        program  = glCreateProgram()
+        # Inicialização das componentes
+        self.materials = list()
+
+        # Para controle de bufferização
+        self.buffered = False
+
+        # Cor de limpeza da tela
+        self.clear_color = (0.0, 0.0, 0.0, 1.0)
+    
+
+    def _build_program(self, vertex_code, fragment_code, digest):
+        ''' 
+        Constrói o programa a partir dos códigos dos shaders, 
+        reaproveitando o binário de uma execução anterior caso exista 
+        '''
+        # Requisição de programa da GPU
+        program = glCreateProgram()
+
+        # Reaproveita o binário de uma construção anterior, caso exista
+        cache_path = os.path.join(_PROGRAM_CACHE_DIR, digest + ".bin")
+        if self._load_program_binary(program, cache_path):
+            return program
+
+        # Requisição de slots da GPU
         vertex   = glCreateShader(GL_VERTEX_SHADER)
         fragment = glCreateShader(GL_FRAGMENT_SHADER)
 
@@ -165,29 +311,116 @@ class OpenGLSession:
         glAttachShader(program, vertex)
         glAttachShader(program, fragment)
 
-        # Construção do programa
+        # Construção do programa, permitindo a recuperação do binário
+        if self._program_binary_supported():
+            glProgramParameteri(program, GL_PROGRAM_BINARY_RETRIEVABLE_HINT, GL_TRUE)
         glLinkProgram(program)
+
+        # Os shaders não são mais necessários após a construção
+        glDetachShader(program, vertex)
+        glDetachShader(program, fragment)
+        glDeleteShader(vertex)
+        glDeleteShader(fragment)
         if not glGetProgramiv(program, GL_LINK_STATUS):
             error = glGetProgramInfoLog(program)
             raise ProgramBuildException(error)
-            
-        # Faz do programa atual o inicializado anteriormente
-        glUseProgram(program)
-        self.program = program
 
-        # Inicialização das componentes
-        self.materials = list()
+        # Armazena o binário para as próximas execuções
+        self._store_program_binary(program, cache_path)
+        return program
 
-        # Ativação do uso de texturas 2D
-        glEnable(GL_TEXTURE_2D)
 
-        # Para controle de bufferização
-        self.buffered = False
+    @staticmethod
+    def _program_binary_supported():
+        ''' Verifica se o driver permite recuperar e carregar binários de programas '''
+        try:
+            return glGetIntegerv(GL_NUM_PROGRAM_BINARY_FORMATS) > 0
+        except GLError:
+            return False
 
-        # Cor de limpeza da tela
-        self.clear_color = (0.0, 0.0, 0.0, 1.0)
+
+    @staticmethod
+    def _driver_signature():
+        ''' Identificação do driver atual, para invalidar binários gerados por outro '''
+        return b"|".join(glGetString(name) or b"" for name in (GL_VENDOR, GL_RENDERER, GL_VERSION))
+
+
+    def _load_program_binary(self, program, path):
+        ''' 
+        Tenta construir o programa a partir de um binário armazenado. 
+        Retorna False caso não exista, tenha sido gerado por outro driver 
+        ou seja rejeitado (por exemplo, após uma atualização), e o programa 
+        deve então ser compilado a partir do código-fonte.
+        '''
+        if not self._program_binary_supported():
+            return False
+        try:
+            with open(path, "rb") as file:
+                data = file.read()
+        except OSError:
+            return False
+
+        # Cabeçalho: identificação do driver, formato e tamanho (4 bytes 
+        # cada) do binário; arquivos truncados são descartados
+        driver, _, data = data.partition(b"\n")
+        if driver != self._driver_signature() or len(data) <= 8:
+            return False
+        binary_format = int.from_bytes(data[:4], "little")
+        binary_length = int.from_bytes(data[4:8], "little")
+        if len(data) - 8 != binary_length:
+            return False
+        binary = np.frombuffer(data, dtype=np.uint8, offset=8)
+        try:
+            glProgramBinary(program, binary_format, binary, binary.size)
+        except GLError:
+            return False
+        return bool(glGetProgramiv(program, GL_LINK_STATUS))
+
+
+    def _store_program_binary(self, program, path):
+        ''' Armazena o binário do programa; falhas apenas desabilitam o cache '''
+        if not self._program_binary_supported():
+            return
+        size = glGetProgramiv(program, GL_PROGRAM_BINARY_LENGTH)
+        if size <= 0:
+            return
+        length = np.zeros(1, dtype=np.int32)
+        binary_format = np.zeros(1, dtype=np.uint32)
+        binary = np.empty(size, dtype=np.uint8)
+        glGetProgramBinary(program, size, length, binary_format, binary)
+        # Escrita em um arquivo temporário do mesmo diretório, que substitui 
+        # o anterior apenas quando completo; uma escrita interrompida nunca 
+        # deixa um binário truncado no cache
+        temp_path = None
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+            with os.fdopen(fd, "wb") as file:
+                file.write(self._driver_signature() + b"\n")
+                file.write(int(binary_format[0]).to_bytes(4, "little"))
+                file.write(int(length[0]).to_bytes(4, "little"))
+                file.write(binary[:length[0]].tobytes())
+            os.replace(temp_path, path)
+        except OSError:
+            if temp_path is not None:
+                try:
+                    os.remove(temp_path)
+                except OSError:
+                    pass
+
+
+    @property
+    def clear_color(self):
+        ''' Cor de limpeza da tela '''
+        return self._clear_color
     
 
+    @clear_color.setter
+    def clear_color(self, value):
+        ''' Atualiza a cor de limpeza, enviada à GPU na próxima limpeza caso difira da atual '''
+        self._clear_color = tuple(value)
+
+
     def enable_polygon_mode(self):
         ''' Ativa o modo poligonal '''
         glPolygonMode(GL_FRONT_AND_BACK, GL_LINE)
@@ -197,6 +430,7 @@ class OpenGLSession:
         ''' Registra um novo componente '''
         for material in component.materials:
             self.materials.append(material)
+        self._version += 1
 
     
     def add_components(self, components:Sequence):
@@ -213,150 +447,173 @@ class OpenGLSession:
         realizar uma nova renderização.
         '''
         self.materials = list()
+        self.draw_ranges = None
+        self.draw_batches = None
+        self._release_textures()
+        self._version += 1
         self.buffered = False
 
+
+    def _release_textures(self):
+        ''' Libera as texturas carregadas na GPU pelo último processamento '''
+        if self.texture_ids:
+            glDeleteTextures(self.texture_ids)
+        self.texture_ids = None
+
     
-    def _load_texture_from_file(self, idx, filename):
-        ''' Carrega uma imagem de textura '''
+    def _load_texture(self, texture_id, image):
+        ''' Carrega uma imagem de textura já decodificada '''
 
         # Associação por ID
-        glBindTexture(GL_TEXTURE_2D, idx)
+        glBindTexture(GL_TEXTURE_2D, texture_id)
 
         # Parâmetros de textura
         glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_S, GL_REPEAT)
         glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_T, GL_REPEAT)
-        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, GL_LINEAR)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, GL_LINEAR_MIPMAP_LINEAR)
         glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAG_FILTER, GL_LINEAR)
 
-        # Processamento da imagem
-        img = Image.open(filename)
-        img_width = img.size[0]
-        img_height = img.size[1]
-        image_data = img.tobytes("raw", "RGB", 0, -1)
-
-        # Associação da imagem
-        glTexImage2D(GL_TEXTURE_2D, 0, GL_RGB, img_width, img_height, 0, GL_RGB, GL_UNSIGNED_BYTE, image_data)
+        # Associação da imagem (linhas sem preenchimento) e geração dos mipmaps
+        img_width, img_height, image_data = image
+        glPixelStorei(GL_UNPACK_ALIGNMENT, 1)
+        glTexImage2D(GL_TEXTURE_2D, 0, GL_RGBA8, img_width, img_height, 0, GL_BGRA, GL_UNSIGNED_INT_8_8_8_8_REV, image_data)
+        glGenerateMipmap(GL_TEXTURE_2D)
     
 
     def _get_vertices(self):
-        ''' Retorna os vértices que integram todos os componentes '''
-        flatten_vertices = np.vstack([mt.vertices for mt in self.materials])
-        vertices = np.zeros(len(flatten_vertices), [("position", np.float32, 3)])
-        vertices["position"] = flatten_vertices
+        ''' 
+        Retorna os vértices que integram todos os componentes, 
+        com posição, textura e normal intercaladas por vértice. 
+        A coordenada V das texturas é invertida, pois as imagens 
+        são enviadas à GPU a partir da primeira linha do arquivo.
+        '''
+        # Buffer alocado uma única vez com o total de vértices
+        total = sum(len(mt.vertices) for mt in self.materials)
+        vertices = np.empty((total, _VERTEX_SIZE), dtype=np.float32)
+
+        # Preenchimento, material a material, em uma única passagem
+        start = 0
+        for mt in self.materials:
+            end = start + len(mt.vertices)
+            chunk = vertices[start:end]
+            chunk[:, 0:3] = mt.vertices
+            chunk[:, 3] = mt.textures[:, 0]
+            np.subtract(1.0, mt.textures[:, 1], out=chunk[:, 4])
+            _pack_normals(mt.normals, chunk[:, 5].view(np.uint32))
+            start = end
         return vertices
-    
-
-    def _get_texture_vertices(self):
-        ''' Retorna os vértices de textura que integram todos os componentes '''
-        flatten_vertices = np.vstack([mt.textures for mt in self.materials])
-        textures = np.zeros(len(flatten_vertices), [("position", np.float32, 2)])
-        textures["position"] = flatten_vertices
-        return textures
-
-
-    def _get_normals_vertices(self):
-        ''' Retorna os vértices das normais que integram todos os componentes '''
-        flatten_vertices = np.vstack([mt.normals for mt in self.materials])
-        normals = np.zeros(len(flatten_vertices), [("position", np.float32, 3)])
-        normals["position"] = flatten_vertices
-        return normals
 
 
     def process_buffers(self):
         ''' Realiza o processamento dos buffers do OpenGL '''
 
-        # Requisição de três slots de buffer da GPU 
-        # (vértices dos polígonos, das texturas e das normais)
-        buffer = glGenBuffers(3)
+        # Nada a reenviar se as componentes não mudaram desde o último processamento
+        if self.buffered and self._buffered_version == self._version:
+            return
 
-        # Envio dos vértices à GPU
-        vertices = self._get_vertices()
-        glBindBuffer(GL_ARRAY_BUFFER, buffer[0])
-        glBufferData(GL_ARRAY_BUFFER, vertices.nbytes, vertices, GL_DYNAMIC_DRAW)
+        # Um único slot de buffer da GPU por sessão, reaproveitado em novos 
+        # processamentos; vértices dos polígonos, das texturas e das normais intercalados.
+        # O vertex array object registra o buffer e o formato dos atributos
+        if self.vertex_buffer is None:
+            self.vertex_array = glGenVertexArrays(1)
+            self.vertex_buffer = glGenBuffers(1)
+        glBindVertexArray(self.vertex_array)
 
-        # Stride e offset do buffer
+        # Envio dos vértices à GPU, substituindo o conteúdo anterior; 
+        # o armazenamento só é realocado quando a capacidade não basta
+        vertices = self._get_vertices()
+        glBindBuffer(GL_ARRAY_BUFFER, self.vertex_buffer)
+        if vertices.nbytes > self._vertex_buffer_capacity:
+            glBufferData(GL_ARRAY_BUFFER, vertices.nbytes, vertices, GL_STATIC_DRAW)
+            self._vertex_buffer_capacity = vertices.nbytes
+        else:
+            glBufferSubData(GL_ARRAY_BUFFER, 0, vertices.nbytes, vertices)
+
+        # Stride do buffer (tamanho de um vértice completo)
         stride = vertices.strides[0]
-        offset = ctypes.c_void_p(0)
-
-        # Associação das posições do GLSL ao buffer de vértices
-        loc_position = glGetAttribLocation(self.program, "position")
-        glEnableVertexAttribArray(loc_position)
-        glVertexAttribPointer(loc_position, 3, GL_FLOAT, False, stride, offset)
 
-        # Geração e carregamento das texturas
-        glGenTextures(len(self.materials))
-        for idx, mt in enumerate(self.materials):
-            self._load_texture_from_file(idx, mt.texture_filepath)
+        # Associação de cada atributo do GLSL ao seu deslocamento no buffer
+        for location, size, gl_type, normalized, offset in _VERTEX_ATTRIBUTES.values():
+            glEnableVertexAttribArray(location)
+            glVertexAttribPointer(location, size, gl_type, normalized, stride, ctypes.c_void_p(offset))
+
+        # Intervalos de desenho (primeiro vértice, quantia) de cada material
+        counts = np.fromiter(
+            (len(mt.vertices) for mt in self.materials), 
+            dtype=np.int32, count=len(self.materials)
+        )
+        firsts = np.zeros_like(counts)
+        np.cumsum(counts[:-1], out=firsts[1:])
+        self.draw_ranges = list(zip(firsts.tolist(), counts.tolist()))
+
+        # Geração e carregamento das texturas; cada arquivo é carregado uma única vez
+        texture_paths = list(dict.fromkeys(str(mt.texture_filepath) for mt in self.materials))
+        self._release_textures()
+        texture_ids = np.atleast_1d(glGenTextures(len(texture_paths))).tolist()
+        textures_by_path = dict(zip(texture_paths, texture_ids))
+        with ThreadPoolExecutor() as executor:
+            images = executor.map(_decode_texture, texture_paths)
+            for texture_id, image in zip(texture_ids, images):
+                self._load_texture(texture_id, image)
+        self.texture_ids = texture_ids
+
+        # Agrupamento dos materiais com mesmo estado (objeto, textura e 
+        # iluminação) em lotes, desenhados com uma única chamada cada
+        batches = dict()
+        for mt, (first, count) in zip(self.materials, self.draw_ranges):
+            texture = textures_by_path[str(mt.texture_filepath)]
+            key = (id(mt.model_ref), texture, mt.ka, mt.kd, mt.ks, mt.ns)
+            batch = batches.get(key)
+            if batch is None:
+                batches[key] = (mt, texture, [first], [count])
+            elif batch[2][-1] + batch[3][-1] == first:
+                batch[3][-1] += count
+            else:
+                batch[2].append(first)
+                batch[3].append(count)
+        self.draw_batches = [
+            (mt, texture, np.array(firsts, dtype=np.int32), np.array(counts, dtype=np.int32))
+            for mt, texture, firsts, counts in batches.values()
+        ]
 
-        # Envio dos vértices de textura à GPU
-        textures = self._get_texture_vertices()
-        glBindBuffer(GL_ARRAY_BUFFER, buffer[1])
-        glBufferData(GL_ARRAY_BUFFER, textures.nbytes, textures, GL_STATIC_DRAW)
-
-        # Stride do buffer de texturas
-        stride = textures.strides[0]
-
-        # Associação das posições do GLSL ao buffer de texturas
-        loc_texture_coord = glGetAttribLocation(self.program, "texture_coord")
-        glEnableVertexAttribArray(loc_texture_coord)
-        glVertexAttribPointer(loc_texture_coord, 2, GL_FLOAT, False, stride, offset)
-
-        # Envio dos vértices das normais à GPU
-        normals = self._get_normals_vertices()
-        glBindBuffer(GL_ARRAY_BUFFER, buffer[2])
-        glBufferData(GL_ARRAY_BUFFER, normals.nbytes, normals, GL_STATIC_DRAW)
-
-        # Stride do buffer de normais
-        stride = normals.strides[0]
-
-        # Associação das posições do GLSL ao buffer de vetores normais
-        loc_normals_coord = glGetAttribLocation(self.program, "normals")
-        glEnableVertexAttribArray(loc_normals_coord)
-        glVertexAttribPointer(loc_normals_coord, 3, GL_FLOAT, False, stride, offset)
-
-        # Aquisição dos buffers de controle das matrizes
-        self.model_buffer = glGetUniformLocation(self.program, "model")
-        self.view_buffer = glGetUniformLocation(self.program, "view")
-        self.projection_buffer = glGetUniformLocation(self.program, "projection")
-
-        # Aquisição dos buffers de controle de iluminação
-        self.ka_buffer = glGetUniformLocation(self.program, "ka")
-        self.kd_buffer = glGetUniformLocation(self.program, "kd")
-        self.ks_buffer = glGetUniformLocation(self.program, "ks")
-        self.ns_buffer = glGetUniformLocation(self.program, "ns")
-        self.light_buffer = glGetUniformLocation(self.program, "lightPos")
-        
         # z-buffer
         glEnable(GL_DEPTH_TEST)
 
         # Flag de bufferização
         self.buffered = True
+        self._buffered_version = self._version
     
 
     def clear(self):
         ''' Limpa a janela da sessão atual '''
+        # A cor de limpeza só é reenviada caso difira da última 
+        # enviada neste contexto, inclusive por outra sessão
+        if _CLEAR_COLORS.get(self._context) != self._clear_color:
+            glClearColor(*self._clear_color)
+            _CLEAR_COLORS[self._context] = self._clear_color
         glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
-        glClearColor(*self.clear_color)
     
 
-    def _render_component(self, idx, num_rendered_vertices, mt):
-        ''' Renderiza um objeto e retorna a quantia de vértices dele '''
-
-        # Quantia de vértices da componente
-        num_vertices = len(mt.vertices)
+    def _render_batch(self, mt, texture, firsts, counts):
+        ''' Renderiza um lote de intervalos de vértices que compartilham o estado de um material '''
 
-        # Controle de iluminação
-        glUniform1f(self.ka_buffer, mt.ka)
-        glUniform1f(self.kd_buffer, mt.kd)
-        glUniform1f(self.ks_buffer, mt.ks)
-        glUniform1f(self.ns_buffer, mt.ns)
+        # Controle de iluminação, enviado apenas quando difere do atual
+        lighting = (mt.ka, mt.kd, mt.ks, mt.ns)
+        if lighting != self._bound_lighting:
+            glUniform4fv(self.lighting_buffer, 1, mt.lighting)
+            self._bound_lighting = lighting
 
-        # Modelo, textura e desenho dos polígonos
-        glUniformMatrix4fv(self.model_buffer, 1, GL_TRUE, mt.model)
-        glBindTexture(GL_TEXTURE_2D, idx)
-        glDrawArrays(GL_TRIANGLES, num_rendered_vertices, num_vertices)
+        # Modelo e textura, enviados apenas quando diferem dos atuais
+        model = mt.model_ref
+        if model is not self._bound_model:
+            glUniformMatrix4fv(self.model_buffer, 1, GL_FALSE, model.gl_pointer)
+            self._bound_model = model
+        if texture != self._bound_texture:
+            glBindTexture(GL_TEXTURE_2D, texture)
+            self._bound_texture = texture
 
-        return num_vertices
+        # Desenho dos polígonos
+        glMultiDrawArrays(GL_TRIANGLES, firsts, counts, len(firsts))
 
 
     def move_light(self, tx, ty, tz):
@@ -371,23 +628,29 @@ class OpenGLSession:
         if self.buffered is False:
             raise UninitializedBufferException("use process_buffers() before rendering")
 
-        # Quantia de vértices renderizados
-        num_rendered_vertices = 0
+        # A matriz model pode ter sido alterada desde o último quadro, e outra 
+        # sessão no mesmo contexto pode ter alterado a textura e a iluminação
+        self._bound_model = None
+        self._bound_texture = None
+        self._bound_lighting = None
+
+        # Buffer e formato dos vértices, associados de uma só vez
+        glBindVertexArray(self.vertex_array)
 
-        # Renderização das componentes
-        for idx, mt in enumerate(flatten(self.materials)):
-            num_rendered_vertices += self._render_component(idx, num_rendered_vertices, mt)
+        # Renderização das componentes, lote a lote
+        for batch in self.draw_batches:
+            self._render_batch(*batch)
     
     
     def view(self, matrix:Sequence = None):
         ''' Envia uma matriz de visão à GPU '''
         if matrix is None:
-            matrix = np.identity(4)
+            matrix = _IDENTITY4
         glUniformMatrix4fv(self.view_buffer, 1, GL_TRUE, matrix)
     
 
     def projection(self, matrix:Sequence = None):
         ''' Envia uma matriz de projeção à GPU '''
         if matrix is None:
-            matrix = np.identity(4)
+            matrix = _IDENTITY4
         glUniformMatrix4fv(self.projection_buffer, 1, GL_TRUE, matrix)
\ No newline at end of file
@@ -1,7 +1,14 @@
 # Dependências
-from numpy import array, float32, dot, cos, sin
+from math import cos, sin
+from numpy import identity, float32, dot
 from collections.abc import Sequence
 
+
+# Matriz identidade compartilhada (somente leitura); 
+# cada transformação parte de uma cópia sua
+_IDENTITY4 = identity(4, dtype=float32)
+_IDENTITY4.setflags(write=False)
+
 def translate(tx:float, ty:float, tz:float = 1.0, origin:Sequence = None):
     '''
     Retorna uma matriz de translação tridimensional 
@@ -18,12 +25,10 @@ def translate(tx:float, ty:float, tz:float = 1.0, origin:Sequence = None):
     origin: Sequence, default = None
         Matriz ao qual multiplicar a transformação.
     '''
-    matrix = array([
-        [1.0, 0.0, 0.0,  tx], 
-        [0.0, 1.0, 0.0,  ty], 
-        [0.0, 0.0, 1.0,  tz],
-        [0.0, 0.0, 0.0, 1.0],
-    ], dtype=float32)
+    matrix = _IDENTITY4.copy()
+    matrix[0, 3] = tx
+    matrix[1, 3] = ty
+    matrix[2, 3] = tz
     if origin is None:
         return matrix
     return dot(origin, matrix)
@@ -45,12 +50,10 @@ def scale(sx:float, sy:float, sz:float = 1.0, origin:Sequence = None):
     origin: Sequence, default = None
         Matriz ao qual multiplicar a transformação.
     '''
-    matrix = array([
-        [ sx, 0.0, 0.0, 0.0], 
-        [0.0,  sy, 0.0, 0.0], 
-        [0.0, 0.0,  sz, 0.0],
-        [0.0, 0.0, 0.0, 1.0],
-    ], dtype=float32)
+    matrix = _IDENTITY4.copy()
+    matrix[0, 0] = sx
+    matrix[1, 1] = sy
+    matrix[2, 2] = sz
     if origin is None:
         return matrix
     return dot(origin, matrix)
@@ -71,12 +74,11 @@ def xrotate(t:float, origin:Sequence = None):
     '''
     c = cos(t)
     s = sin(t)
-    matrix = array([
-        [1.0, 0.0, 0.0, 0.0], 
-        [0.0,  +c,  -s, 0.0], 
-        [0.0,  +s,  +c, 0.0],
-        [0.0, 0.0, 0.0, 1.0],
-    ], dtype=float32)
+    matrix = _IDENTITY4.copy()
+    matrix[1, 1] = +c
+    matrix[1, 2] = -s
+    matrix[2, 1] = +s
+    matrix[2, 2] = +c
     if origin is None:
         return matrix
     return dot(origin, matrix)
@@ -97,12 +99,11 @@ def yrotate(t:float, origin:Sequence = None):
     '''
     c = cos(t)
     s = sin(t)
-    matrix = array([
-        [ +c, 0.0,  +s, 0.0], 
-        [0.0, 1.0, 0.0, 0.0], 
-        [ -s, 0.0,  +c, 0.0],
-        [0.0, 0.0, 0.0, 1.0],
-    ], dtype=float32)
+    matrix = _IDENTITY4.copy()
+    matrix[0, 0] = +c
+    matrix[0, 2] = +s
+    matrix[2, 0] = -s
+    matrix[2, 2] = +c
     if origin is None:
         return matrix
     return dot(origin, matrix)
@@ -123,12 +124,11 @@ def zrotate(t:float, origin:Sequence = None):
     '''
     c = cos(t)
     s = sin(t)
-    matrix = array([
-        [ +c,  -s, 0.0, 0.0], 
-        [ +s,  +c, 0.0, 0.0], 
-        [0.0, 0.0, 1.0, 0.0],
-        [0.0, 0.0, 0.0, 1.0],
-    ], dtype=float32)
+    matrix = _IDENTITY4.copy()
+    matrix[0, 0] = +c
+    matrix[0, 1] = -s
+    matrix[1, 0] = +s
+    matrix[1, 1] = +c
     if origin is None:
         return matrix
     return dot(origin, matrix)
@@ -144,16 +144,25 @@ def relative_zrotate(t:float, x0:float=0.0, y0:float=0.0, z0:float=0.0, origin:S
     ----------
     t: float
         Ângulo de rotação em radianos.
+    x0: float, default = 0.0
+        Abscissa do ponto de referência.
+    y0: float, default = 0.0
+        Ordenada do ponto de referência.
+    z0: float, default = 0.0
+        Cota do ponto de referência.
     origin: Sequence, default = None
         Matriz ao qual multiplicar a transformação.
     '''
-    matrix = dot(
-        translate(x0, y0, z0), 
-        dot(
-            zrotate(t),
-            translate(-x0, -y0, -z0)
-        )
-    )
+    # Forma fechada de translate(x0,y0,z0) . zrotate(t) . translate(-x0,-y0,-z0)
+    c = cos(t)
+    s = sin(t)
+    matrix = _IDENTITY4.copy()
+    matrix[0, 0] = +c
+    matrix[0, 1] = -s
+    matrix[0, 3] = x0 - c*x0 + s*y0
+    matrix[1, 0] = +s
+    matrix[1, 1] = +c
+    matrix[1, 3] = y0 - s*x0 - c*y0
     if origin is None:
         return matrix
     return dot(origin, matrix)
\ No newline at end of file
@@ -1,10 +1,12 @@
 # Dependências
-from inspect import signature
+from inspect import signature, Parameter
 from functools import wraps
 
 
-# Descritor de um atributo
+# Descritor de um atributo; opções adicionais 
+# exigem o respectivo slot na subclasse
 class Descriptor:
+    __slots__ = ('name',)
     def __init__(self, name=None, **opts):
         self.name = name
         for key, value in opts.items():
@@ -15,6 +17,7 @@ class Descriptor:
 
 # Descritor para garantir tipagem
 class Typed(Descriptor):
+    __slots__ = ()
     expected_type = type(None)
     def __set__(self, instance, value):
         if not isinstance(value, self.expected_type):
@@ -29,6 +32,7 @@ class Typed(Descriptor):
 
 # Descritor para garantir valores sem sinal
 class Unsigned(Descriptor):
+    __slots__ = ()
     def __set__(self, instance, value):
         if value < 0:
             raise ValueError("expected an unsigned value")
@@ -37,16 +41,18 @@ class Unsigned(Descriptor):
 
 # Inteiro
 class Integer(Typed):
+    __slots__ = ()
     expected_type = int
 
 
 # Inteiro sem sinal
 class UnsignedInteger(Integer, Unsigned):
-    pass
+    __slots__ = ()
 
 
 # String
 class String(Typed):
+    __slots__ = ()
     expected_type = str
 
 
@@ -64,24 +70,57 @@ def typeassert(*ty_args, _is_method=False, **ty_kwargs):
         func_sig = signature(func)
         bound_types = func_sig.bind_partial(*ty_args, **ty_kwargs).arguments
 
+        # Parâmetros verificados, resolvidos uma única vez: posição (caso 
+        # aceite argumentos posicionais), nome e tipo. O primeiro parâmetro 
+        # de um método (self) nunca é verificado
+        positional = (Parameter.POSITIONAL_ONLY, Parameter.POSITIONAL_OR_KEYWORD)
+        variadic = (Parameter.VAR_POSITIONAL, Parameter.VAR_KEYWORD)
+        first = 1 if _is_method == True else 0
+        params = [
+            (index, param) for index, param in enumerate(func_sig.parameters.values()) 
+            if index >= first and param.name in bound_types
+        ]
+        checks = tuple(
+            (index if param.kind in positional else None, param.name, bound_types[param.name])
+            for index, param in params
+        )
+
+        # Tipos impostos a *args ou **kwargs exigem a associação completa
+        bind_required = any(param.kind in variadic for _, param in params)
+
+        # Exceção de tipo inválido
+        def type_error(name, expected):
+            return TypeError(
+                "argument {} must be {}".format(
+                    name, 
+                    str(expected).replace('<', '{').replace('>', '}')
+                )
+            )
+
         # Envólucro da função
         @wraps(func)
         def wrapper(*args, **kwargs):
 
             # Imposição de tipos aos argumentos
-            bound_values = func_sig.bind(*args, **kwargs)
-            iterable = iter(bound_values.arguments.items())
-            if _is_method == True:
-                next(iterable)
-            for name, value in iterable:
-                if name in bound_types:
-                    if not isinstance(value, bound_types[name]):
-                        raise TypeError(
-                            "argument {} must be {}".format(
-                                name, 
-                                str(bound_types[name]).replace('<', '{').replace('>', '}')
-                            )
-                        )
+            if bind_required:
+                bound_values = func_sig.bind(*args, **kwargs)
+                iterable = iter(bound_values.arguments.items())
+                if _is_method == True:
+                    next(iterable)
+                for name, value in iterable:
+                    if name in bound_types:
+                        if not isinstance(value, bound_types[name]):
+                            raise type_error(name, bound_types[name])
+            else:
+                for index, name, expected in checks:
+                    if index is not None and index < len(args):
+                        value = args[index]
+                    elif name in kwargs:
+                        value = kwargs[name]
+                    else:
+                        continue
+                    if not isinstance(value, expected):
+                        raise type_error(name, expected)
             
             # Finalização
             return func(*args, **kwargs)
@@ -89,17 +128,28 @@ def typeassert(*ty_args, _is_method=False, **ty_kwargs):
     return decorator
 
 
-# Levanta uma exceção caso a variável não seja do tipo especificado
-def check_type(var, nam, typ):
-    if not isinstance(var, typ):
-        raise TypeError (
-            "expected '{}' to be {}".format(
-                nam, str(typ).replace('<', '{').replace('>', '}')
+# Verificações de tipo; desabilitadas em modo otimizado ("python -O"), 
+# no qual as funções permanecem disponíveis, porém sem efeito
+if __debug__:
+
+    # Levanta uma exceção caso a variável não seja do tipo especificado
+    def check_type(var, nam, typ):
+        if not isinstance(var, typ):
+            raise TypeError (
+                "expected '{}' to be {}".format(
+                    nam, str(typ).replace('<', '{').replace('>', '}')
+                )
             )
-        )
 
+    # Levanta uma exceção caso a variável, possivelmente nula, não seja do tipo especificado
+    def check_nullable_type(var, nam, typ):
+        if var is not None:
+            return check_type(var, nam, typ)
+
+else:
+
+    def check_type(var, nam, typ):
+        pass
 
-# Levanta uma exceção caso a variável, possivelmente nula, não seja do tipo especificado
-def check_nullable_type(var, nam, typ):
-    if var is not None:
-        return check_type(var, nam, typ)
\ No newline at end of file
+    def check_nullable_type(var, nam, typ):
+        pass